@@ -11,44 +11,174 @@ Author: Soul-19129
 License: MIT
 """
 
+import os
+
+# Optional gevent monkey-patching for production (gunicorn -k gevent).
+# This must happen before gtts/speech_recognition pull in requests/urllib3,
+# so it sits at the very top of the module and is gated by an env var to
+# keep the development server untouched.
+if os.getenv('USE_GEVENT', 'False').lower() == 'true':
+    from gevent import monkey
+    monkey.patch_all()
+
 from flask import Flask, request, jsonify, render_template
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import atexit
+import json
 import logging
-import os
-from datetime import datetime
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Import our custom modules
 try:
-    from translator import HumanTranslator
-    from speech import SpeechHandler
-    from utils import validate_language_code, log_translation, get_supported_languages
+    from translator import HumanTranslator, TranslationCache
+    from speech import SpeechHandler, StreamingTranscriber
+    from utils import log_translation, get_supported_languages
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Make sure all required files are in the same directory")
     exit(1)
 
+# orjson is optional but recommended: its C encoder is several times
+# faster than stdlib json, and jsonify sits on the hot path of every
+# endpoint (batch-translate responses especially grow with batch size)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Initialize Flask app
 app = Flask(__name__)
-CORS(app)  # Enable CORS for web interface
 
-# Configure logging
+# CORS only matters for the browser-facing /api/* routes; scoping it there
+# keeps the after_request hook off server-to-server endpoints. Origins can
+# be restricted via CORS_ORIGINS (comma-separated, defaults to any).
+CORS_ORIGINS = [o.strip() for o in os.getenv('CORS_ORIGINS', '*').split(',')]
+# automatic_options=False hands preflights to the cheap route below instead
+# of flask-cors rebuilding the response per request
+CORS(app, resources={r"/api/*": {"origins": CORS_ORIGINS}},
+     automatic_options=False)
+
+# Preflight responses are static per origin, so build the header block once
+_ALLOWED_ORIGINS = frozenset(CORS_ORIGINS)
+_PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Max-Age': '86400',
+    # The allow-origin header varies per requesting origin, so shared
+    # caches must key preflight responses on it
+    'Vary': 'Origin'
+}
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+@app.before_request
+def api_preflight():
+    """Answer /api/* CORS preflights early with precomputed headers"""
+    if request.method != 'OPTIONS' or not request.path.startswith('/api/'):
+        return None
+    if '*' in _ALLOWED_ORIGINS:
+        origin = '*'
+    else:
+        origin = request.headers.get('Origin', '')
+        if origin not in _ALLOWED_ORIGINS:
+            return app.response_class('', 204, {'Vary': 'Origin'})
+    headers = dict(_PREFLIGHT_HEADERS)
+    headers['Access-Control-Allow-Origin'] = origin
+    return app.response_class('', 204, headers)
+
+# Configure logging. Records go through a queue drained by a dedicated
+# listener thread, so request threads never block on the disk write (and,
+# under gevent, never stall the event loop on a flush).
+log_queue = queue.Queue(-1)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(log_queue)]
+)
+log_listener = QueueListener(
+    log_queue,
+    RotatingFileHandler('logs/app.log', maxBytes=10 << 20, backupCount=5),
+    logging.StreamHandler()
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
-# Initialize components
-translator = HumanTranslator()
-speech_handler = SpeechHandler()
+# Initialize components. TRANSLATION_CACHE_DB points the translator cache
+# at a sqlite file so warm translations survive restarts; unset keeps the
+# cache purely in memory.
+translator = HumanTranslator(persist_path=os.getenv('TRANSLATION_CACHE_DB') or None)
+speech_handler = SpeechHandler(stt_engine=os.getenv('STT_ENGINE', 'google'))
+
+# API-level translation cache. UI phrases, client retries, and duplicated
+# batch entries repeat the same (text, source, target) triples constantly;
+# serving those from memory skips the upstream round-trip entirely.
+api_cache = TranslationCache(max_size=10000, expire_hours=72)
+
+def _cache_key(text, target_lang, source_lang=None):
+    """
+    Build the API cache key as a plain tuple: TranslationCache hashes
+    tuple keys directly, so no per-lookup encode + digest is needed
+    """
+    return (text, source_lang or 'auto', target_lang)
+
+def _cached_translate(text, target_lang, source_lang=None):
+    """
+    Translate through the API-level cache.
+
+    Returns the cached result when the same request was seen within the
+    cache TTL, otherwise calls the translator and caches successful results.
+    """
+    key = _cache_key(text, target_lang, source_lang)
+    cached = api_cache.get(key)
+    if cached:
+        return cached
+
+    result = translator.translate(
+        text=text,
+        target_language=target_lang,
+        source_language=source_lang
+    )
+    if result['success']:
+        api_cache.set(key, result)
+    return result
 
 # Create logs directory if it doesn't exist
 os.makedirs('logs', exist_ok=True)
 
+# Resolve static facts once at startup instead of per request: whether the
+# web UI is present, and the (static) supported-languages mapping
+app.config['HAS_WEB_UI'] = os.path.exists('web/index.html')
+SUPPORTED_LANGUAGES = get_supported_languages()
+
+# Frozenset of valid codes for O(1) membership checks in the handlers;
+# validate_language_code stays available for external callers
+VALID_LANGS = frozenset(SUPPORTED_LANGUAGES)
+
+# Reject oversized JSON bodies from Content-Length alone, before the JSON
+# decoder ever runs over them
+MAX_BODY_BYTES = 1 << 20
+
+# The /api/languages payload never changes during a process lifetime, so
+# encode the JSON body once and return the same bytes on every hit
+LANGUAGES_RESPONSE_BODY = json.dumps({
+    'languages': SUPPORTED_LANGUAGES,
+    'total': len(SUPPORTED_LANGUAGES)
+}, ensure_ascii=False)
+
 @app.route('/')
 def home():
     """
@@ -56,7 +186,7 @@ def home():
     """
     try:
         # If web interface exists, serve it
-        if os.path.exists('web/index.html'):
+        if app.config['HAS_WEB_UI']:
             return render_template('index.html')
         else:
             # Return API information if web interface not found
@@ -81,9 +211,11 @@ def health_check():
     """
     Health check endpoint
     """
+    # Unix epoch seconds: time.time() is a single C call, unlike building
+    # and formatting a datetime object on every probe
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': int(time.time()),
         'version': '1.0.0'
     })
 
@@ -92,15 +224,7 @@ def get_languages():
     """
     Get list of supported languages
     """
-    try:
-        languages = get_supported_languages()
-        return jsonify({
-            'languages': languages,
-            'total': len(languages)
-        })
-    except Exception as e:
-        logger.error(f"Error getting languages: {e}")
-        return jsonify({'error': 'Failed to get languages'}), 500
+    return app.response_class(LANGUAGES_RESPONSE_BODY, mimetype='application/json')
 
 @app.route('/api/translate', methods=['POST'])
 def translate_text():
@@ -115,7 +239,10 @@ def translate_text():
     }
     """
     try:
-        data = request.get_json()
+        if request.content_length and request.content_length > MAX_BODY_BYTES:
+            return jsonify({'error': 'Request body too large'}), 413
+
+        data = request.get_json(silent=True)
         
         # Validate required fields
         if not data or 'text' not in data or 'target' not in data:
@@ -131,17 +258,17 @@ def translate_text():
         if not text:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
-        if not validate_language_code(target_lang):
+        if target_lang not in VALID_LANGS:
             return jsonify({'error': 'Invalid target language code'}), 400
-        
-        if source_lang != 'auto' and not validate_language_code(source_lang):
+
+        if source_lang != 'auto' and source_lang not in VALID_LANGS:
             return jsonify({'error': 'Invalid source language code'}), 400
         
-        # Perform translation
-        result = translator.translate(
+        # Perform translation (served from the API cache when possible)
+        result = _cached_translate(
             text=text,
-            target_language=target_lang,
-            source_language=source_lang if source_lang != 'auto' else None
+            target_lang=target_lang,
+            source_lang=source_lang if source_lang != 'auto' else None
         )
         
         if result['success']:
@@ -230,11 +357,15 @@ def text_to_speech():
     {
         "text": "Hello world",
         "language": "en",
-        "slow": false  # optional, for slow speech
+        "slow": false,   # optional, for slow speech
+        "async": false   # optional, queue synthesis and poll the audio_url
     }
     """
     try:
-        data = request.get_json()
+        if request.content_length and request.content_length > MAX_BODY_BYTES:
+            return jsonify({'error': 'Request body too large'}), 413
+
+        data = request.get_json(silent=True)
         
         # Validate required fields
         if not data or 'text' not in data or 'language' not in data:
@@ -250,20 +381,29 @@ def text_to_speech():
         if not text:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
-        if not validate_language_code(language):
+        if language not in VALID_LANGS:
             return jsonify({'error': 'Invalid language code'}), 400
         
-        # Convert text to speech
-        result = speech_handler.text_to_speech(
-            text=text,
-            language=language,
-            slow=slow
-        )
-        
+        # Convert text to speech; async mode queues the synthesis in the
+        # background and the client polls audio_url until the file exists
+        if data.get('async', False):
+            result = speech_handler.text_to_speech_async(
+                text=text,
+                language=language,
+                slow=slow
+            )
+        else:
+            result = speech_handler.text_to_speech(
+                text=text,
+                language=language,
+                slow=slow
+            )
+
         if result['success']:
             return jsonify({
                 'success': True,
                 'audio_url': result['audio_url'],
+                'pending': result.get('pending', False),
                 'duration': result.get('duration'),
                 'language': language
             })
@@ -293,7 +433,10 @@ def batch_translate():
     }
     """
     try:
-        data = request.get_json()
+        if request.content_length and request.content_length > MAX_BODY_BYTES:
+            return jsonify({'error': 'Request body too large'}), 413
+
+        data = request.get_json(silent=True)
         
         # Validate required fields
         if not data or 'texts' not in data or 'target' not in data:
@@ -312,34 +455,50 @@ def batch_translate():
         if len(texts) > 100:  # Limit batch size
             return jsonify({'error': 'Maximum 100 texts per batch'}), 400
         
-        if not validate_language_code(target_lang):
+        if target_lang not in VALID_LANGS:
             return jsonify({'error': 'Invalid target language code'}), 400
-        
-        # Process batch translation
-        results = []
+
+        source = source_lang if source_lang != 'auto' else None
+
+        # Deduplicate inputs, serve API-cache hits, and push every remaining
+        # unique text through the translator's batch path in one call so the
+        # backend can merge them into as few upstream requests as possible
+        results = [None] * len(texts)
+        resolved = {}  # unique stripped text -> translation result
         for text in texts:
+            stripped = text.strip()
+            if stripped and stripped not in resolved:
+                resolved[stripped] = api_cache.get(_cache_key(stripped, target_lang, source))
+
+        misses = [text for text, cached in resolved.items() if cached is None]
+        if misses:
+            batch_results = translator.translate_batch(
+                texts=misses,
+                target_language=target_lang,
+                source_language=source
+            )
+            for stripped, result in zip(misses, batch_results):
+                resolved[stripped] = result
+                if result['success']:
+                    api_cache.set(_cache_key(stripped, target_lang, source), result)
+
+        for idx, text in enumerate(texts):
             if not text.strip():
-                results.append({
+                results[idx] = {
                     'success': False,
                     'error': 'Empty text',
                     'original_text': text
-                })
+                }
                 continue
-            
-            result = translator.translate(
-                text=text.strip(),
-                target_language=target_lang,
-                source_language=source_lang if source_lang != 'auto' else None
-            )
-            
-            results.append({
+            result = resolved[text.strip()]
+            results[idx] = {
                 'success': result['success'],
                 'original_text': text,
                 'translated_text': result.get('translated_text'),
                 'detected_language': result.get('detected_language'),
                 'error': result.get('error')
-            })
-        
+            }
+
         return jsonify({
             'success': True,
             'results': results,
@@ -354,6 +513,43 @@ def batch_translate():
             'error': 'Batch translation failed'
         }), 500
 
+# Streaming STT over WebSocket. Registered only when flask-sock is
+# installed and the local whisper engine is active - the agreement check
+# needs the word timestamps faster-whisper provides.
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
+
+if Sock is not None and speech_handler.stt_engine == 'whisper':
+    sock = Sock(app)
+
+    @sock.route('/ws/speech-to-text')
+    def speech_to_text_stream(ws):
+        """
+        Stream 16kHz 16-bit mono PCM frames and receive committed text.
+
+        Partial results are pushed as soon as two consecutive decodes agree
+        on them (LocalAgreement-2), so the first words arrive about a second
+        after speech starts instead of after the whole clip is uploaded.
+        Send the text message 'stop' to flush and close.
+        """
+        language = request.args.get('language')
+        transcriber = StreamingTranscriber(speech_handler, language=language)
+        try:
+            while True:
+                data = ws.receive()
+                if data is None or data == 'stop':
+                    break
+                if isinstance(data, str):
+                    continue  # ignore other control messages
+                committed = transcriber.add_pcm16(data)
+                if committed:
+                    ws.send(json.dumps({'text': committed, 'final': False}))
+            ws.send(json.dumps({'text': transcriber.flush(), 'final': True}))
+        except Exception as e:
+            logger.error(f"Streaming STT error: {e}")
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
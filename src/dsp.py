@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HumanTranslator - DSP Helpers
+=============================
+
+Small numeric kernels for the speech pipeline: amplitude scanning,
+amplitude scaling, and RMS. When numba is installed the kernels are
+JIT-compiled with fastmath so LLVM autovectorizes the sample loops into
+packed SIMD float instructions; numpy fallbacks keep behaviour identical
+without the dependency.
+
+Kernels expect float32/float64 arrays - convert integer PCM with
+.astype(np.float32) before calling.
+
+Author: Soul-19129
+License: MIT
+"""
+
+import numpy as np
+
+# numba is optional: without it the numpy implementations below are used
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(fastmath=True, cache=True)
+    def peak_amplitude(x):
+        """Maximum absolute sample value in x"""
+        peak = 0.0
+        for i in range(x.shape[0]):
+            value = abs(x[i])
+            if value > peak:
+                peak = value
+        return peak
+
+    @njit(fastmath=True, cache=True)
+    def rms(x):
+        """Root-mean-square level of x"""
+        n = x.shape[0]
+        if n == 0:
+            return 0.0
+        acc = 0.0
+        for i in range(n):
+            acc += x[i] * x[i]
+        return (acc / n) ** 0.5
+
+    @njit(fastmath=True, cache=True)
+    def scale(x, q):
+        """Scale every sample by q (b' = q * b)"""
+        out = np.empty_like(x)
+        for i in range(x.shape[0]):
+            out[i] = x[i] * q
+        return out
+
+else:
+
+    def peak_amplitude(x):
+        """Maximum absolute sample value in x"""
+        if x.shape[0] == 0:
+            return 0.0
+        return float(np.abs(x).max())
+
+    def rms(x):
+        """Root-mean-square level of x"""
+        if x.shape[0] == 0:
+            return 0.0
+        return float(np.sqrt(np.mean(np.square(x))))
+
+    def scale(x, q):
+        """Scale every sample by q (b' = q * b)"""
+        return x * q
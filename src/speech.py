@@ -11,63 +11,182 @@ Author: Soul-19129
 License: MIT
 """
 
+import hashlib
+import io
 import os
-import uuid
+import shutil
+import tempfile
+import threading
 import time
+import wave
 import logging
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
 
+import numpy as np
+
+import dsp
 from gtts import gTTS
 import speech_recognition as sr
 
+# faster-whisper is optional: when installed, SpeechHandler can transcribe
+# on-device (CTranslate2 backend, INT8 on CPU) instead of sending audio to
+# the rate-limited Google Web Speech API
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 SUPPORTED_AUDIO_EXT = {'.wav', '.mp3', '.m4a', '.ogg', '.flac', '.aiff', '.aif'}
 AUDIO_OUTPUT_DIR = os.path.join('web', 'audio')
+# Cap on cached TTS files; least-recently-used files are evicted beyond this
+MAX_CACHED_AUDIO_FILES = 500
 
 # Ensure output directory exists for generated audio
 os.makedirs(AUDIO_OUTPUT_DIR, exist_ok=True)
 
+# Scratch directory for the disk-fallback STT path; created once at import
+# instead of stat+mkdir on every request
+TMP_DIR = os.path.join('logs', 'tmp_audio')
+os.makedirs(TMP_DIR, exist_ok=True)
+
+# Per-thread reusable upload buffer, so short clips don't allocate a fresh
+# BytesIO (and its backing storage) on every request
+_scratch = threading.local()
+
+def _get_scratch_buffer() -> io.BytesIO:
+    buf = getattr(_scratch, 'buf', None)
+    if buf is None:
+        buf = io.BytesIO()
+        _scratch.buf = buf
+    buf.seek(0)
+    buf.truncate(0)
+    return buf
+
 class SpeechHandler:
     """
     Handles speech-to-text and text-to-speech operations
     """
 
-    def __init__(self, default_lang: str = 'en'):
+    # Pre-decode gating thresholds: clips shorter than min_clip_seconds or
+    # whose peak amplitude never rises above silence_peak_threshold (as a
+    # fraction of full scale) are rejected before recognition runs
+    min_clip_seconds = 0.3
+    silence_peak_threshold = 0.01
+
+    def __init__(self, default_lang: str = 'en', tts_workers: int = 4,
+                 stt_engine: str = 'google', whisper_model_size: str = 'small'):
         self.default_lang = default_lang
+        # 'google' sends audio to the Google Web Speech API (network
+        # round-trip, rate-limited); 'whisper' runs faster-whisper locally
+        # when the package is installed
+        if stt_engine == 'whisper' and WhisperModel is None:
+            logger.warning("faster-whisper not installed, falling back to google STT")
+            stt_engine = 'google'
+        self.stt_engine = stt_engine
+        self.whisper_model_size = whisper_model_size
+        self._whisper_model = None  # loaded lazily on first use
+        self._whisper_lock = threading.Lock()
+        # Background pool for TTS synthesis: the gTTS call is an upstream
+        # HTTP request, so running it off the request thread keeps web
+        # workers free while audio is being generated
+        self.tts_executor = ThreadPoolExecutor(
+            max_workers=tts_workers, thread_name_prefix='tts')
         self.recognizer = sr.Recognizer()
-        # Tune for better performance in noisy environments
+        # Fixed energy threshold tuned once at startup. Dynamic re-estimation
+        # only helps for live microphone input, not uploaded files, so keep it
+        # off to avoid extra per-request CPU during record().
         self.recognizer.energy_threshold = 300
-        self.recognizer.dynamic_energy_threshold = True
+        self.recognizer.dynamic_energy_threshold = False
         logger.info("SpeechHandler initialized")
 
     def _secure_filename(self, base: str, ext: str) -> str:
         safe_ext = ext.lower() if ext.lower() in SUPPORTED_AUDIO_EXT else '.mp3'
         return f"{base}{safe_ext}"
 
+    def _synthesize(self, text: str, language: str, slow: bool, filepath: str):
+        """Run the gTTS synthesis and atomically publish the audio file (blocking)"""
+        tts = gTTS(text=text, lang=language, slow=slow)
+        # Synthesize into a temp file in the same directory and rename into
+        # place: async pollers and the exists-check cache hit must never see
+        # a half-written mp3 (nginx serves /audio/ with immutable caching),
+        # and concurrent synths of the same text can't interleave writes
+        fd, tmp_path = tempfile.mkstemp(suffix='.part', dir=AUDIO_OUTPUT_DIR)
+        os.close(fd)
+        try:
+            tts.save(tmp_path)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _prepare_tts(self, text: str, language: str, slow: bool = False):
+        """Validate TTS input and build the output filename/filepath/url"""
+        if not text or not text.strip():
+            return None, {'success': False, 'error': 'Text cannot be empty'}
+        if not language or len(language) < 2:
+            return None, {'success': False, 'error': 'Invalid language code'}
+
+        # Content-hashed filename: identical (text, language, slow) triples
+        # map to the same file, so repeated requests reuse existing audio
+        # instead of paying the upstream synthesis call again
+        key = f"{language.lower()}|{int(slow)}|{text.strip()}"
+        file_id = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        filename = self._secure_filename(file_id, '.mp3')
+        filepath = os.path.join(AUDIO_OUTPUT_DIR, filename)
+        return (text.strip(), language.lower(), filename, filepath), None
+
+    def _evict_old_audio(self):
+        """Trim the audio cache directory to MAX_CACHED_AUDIO_FILES, oldest first"""
+        try:
+            entries = []
+            with os.scandir(AUDIO_OUTPUT_DIR) as it:
+                for entry in it:
+                    if entry.is_file():
+                        entries.append((entry.stat().st_mtime, entry.path))
+            excess = len(entries) - MAX_CACHED_AUDIO_FILES
+            if excess > 0:
+                for _, path in sorted(entries)[:excess]:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        except Exception as e:
+            logger.warning(f"Audio cache eviction failed: {e}")
+
     def text_to_speech(self, text: str, language: str, slow: bool = False) -> Dict:
         """
         Convert text to speech and save to static file served by web server.
         Returns a dict with success flag and audio_url.
         """
         try:
-            if not text or not text.strip():
-                return {'success': False, 'error': 'Text cannot be empty'}
-            if not language or len(language) < 2:
-                return {'success': False, 'error': 'Invalid language code'}
+            prepared, error = self._prepare_tts(text, language, slow)
+            if error:
+                return error
+            text, language, filename, filepath = prepared
+            audio_url = f"/audio/{filename}"
 
-            tts = gTTS(text=text.strip(), lang=language.lower(), slow=slow)
-            file_id = uuid.uuid4().hex
-            filename = self._secure_filename(file_id, '.mp3')
-            filepath = os.path.join(AUDIO_OUTPUT_DIR, filename)
+            # Reuse previously synthesized audio for identical input
+            if os.path.exists(filepath):
+                os.utime(filepath)  # refresh mtime so eviction stays LRU
+                logger.debug("TTS cache hit: %s", audio_url)
+                return {
+                    'success': True,
+                    'audio_url': audio_url,
+                    'duration': None,
+                    'cached': True
+                }
 
-            # Save audio file
-            tts.save(filepath)
+            self._synthesize(text, language, slow, filepath)
+            self.tts_executor.submit(self._evict_old_audio)
 
-            # Build URL path relative to web root
-            audio_url = f"/audio/{filename}"
-            logger.info(f"TTS generated: {audio_url}")
+            logger.debug("TTS generated: %s", audio_url)
             return {
                 'success': True,
                 'audio_url': audio_url,
@@ -77,38 +196,173 @@ class SpeechHandler:
             logger.error(f"Text-to-speech failed: {e}")
             return {'success': False, 'error': 'Text-to-speech failed'}
 
-    def speech_to_text(self, audio_file, language: Optional[str] = None) -> Dict:
+    def text_to_speech_async(self, text: str, language: str, slow: bool = False) -> Dict:
+        """
+        Queue text-to-speech synthesis on the background pool and return
+        immediately with the audio URL the file will appear under.
+
+        The response carries pending=True; clients poll the audio_url until
+        the file is available. This frees the web worker for the duration of
+        the upstream gTTS call.
+        """
+        try:
+            prepared, error = self._prepare_tts(text, language, slow)
+            if error:
+                return error
+            text, language, filename, filepath = prepared
+            audio_url = f"/audio/{filename}"
+
+            # Already synthesized - no need to queue anything
+            if os.path.exists(filepath):
+                os.utime(filepath)
+                return {
+                    'success': True,
+                    'audio_url': audio_url,
+                    'duration': None,
+                    'cached': True
+                }
+
+            self.tts_executor.submit(self._synthesize, text, language, slow, filepath)
+            self.tts_executor.submit(self._evict_old_audio)
+
+            logger.debug("TTS queued: %s", audio_url)
+            return {
+                'success': True,
+                'pending': True,
+                'audio_url': audio_url,
+                'duration': None
+            }
+        except Exception as e:
+            logger.error(f"Text-to-speech enqueue failed: {e}")
+            return {'success': False, 'error': 'Text-to-speech failed'}
+
+    def _get_whisper_model(self):
+        """Load the faster-whisper model on first use (INT8 on CPU, double-checked)"""
+        if self._whisper_model is None:
+            with self._whisper_lock:
+                if self._whisper_model is None:
+                    self._whisper_model = WhisperModel(
+                        self.whisper_model_size, device='cpu', compute_type='int8')
+                    logger.info(f"Loaded faster-whisper model '{self.whisper_model_size}'")
+        return self._whisper_model
+
+    def _whisper_transcribe(self, buf: io.BytesIO, language: Optional[str]):
+        """Transcribe an in-memory clip locally via faster-whisper"""
+        model = self._get_whisper_model()
+        buf.seek(0)
+        # Whisper uses bare ISO codes ('en'), not locale tags ('en-US')
+        lang = language.split('-')[0].lower() if language else None
+        segments, info = model.transcribe(buf, language=lang, vad_filter=True)
+        text = ' '.join(segment.text.strip() for segment in segments).strip()
+        return text, info.language
+
+    def _has_speech(self, buf: io.BytesIO) -> Optional[bool]:
+        """
+        Cheap pre-decode speech check on an in-memory WAV clip.
+
+        Returns False when the clip is too short or never rises above the
+        silence threshold, True when there is audio worth decoding, and
+        None when the container couldn't be parsed as WAV (no opinion -
+        the caller should proceed to recognition).
+        """
+        try:
+            buf.seek(0)
+            with wave.open(buf, 'rb') as w:
+                framerate = w.getframerate()
+                nframes = w.getnframes()
+                sampwidth = w.getsampwidth()
+                if framerate <= 0:
+                    return None
+                if nframes / framerate < self.min_clip_seconds:
+                    return False
+                raw = w.readframes(nframes)
+
+            if sampwidth == 2:
+                samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+                full_scale = 32768.0
+            elif sampwidth == 1:
+                samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0)
+                full_scale = 128.0
+            else:
+                return None
+            if len(samples) == 0:
+                return False
+            peak = dsp.peak_amplitude(samples) / full_scale
+            return bool(peak >= self.silence_peak_threshold)
+        except Exception:
+            return None
+        finally:
+            buf.seek(0)
+
+    def _record(self, source_ref, calibrate: bool) -> sr.AudioData:
+        """Capture audio from a path or file-like object via sr.AudioFile"""
+        with sr.AudioFile(source_ref) as source:
+            if calibrate:
+                self.recognizer.adjust_for_ambient_noise(source, duration=0.3)
+            return self.recognizer.record(source)
+
+    def _record_from_disk(self, buf: io.BytesIO, calibrate: bool) -> sr.AudioData:
+        """Fallback path: write the buffer to a temp file and record from it"""
+        with tempfile.NamedTemporaryFile(dir=TMP_DIR, suffix='.wav', delete=False) as f:
+            tmp_path = f.name
+            f.write(buf.getbuffer())
+        try:
+            return self._record(tmp_path, calibrate)
+        finally:
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
+
+    def speech_to_text(self, audio_file, language: Optional[str] = None,
+                       calibrate: bool = False) -> Dict:
         """
         Convert an uploaded audio file (werkzeug FileStorage) to text.
         Optionally specify language code (e.g., 'en-US', 'ar', etc.).
         Uses Google Web Speech API via SpeechRecognition (free, rate-limited).
+
+        Ambient-noise calibration is off by default: it consumes ~300ms of
+        the clip before recognition and adds little for pre-recorded uploads.
+        Pass calibrate=True for recordings made in noisy environments.
         """
         try:
-            # Save temporary file
-            tmp_dir = os.path.join('logs', 'tmp_audio')
-            os.makedirs(tmp_dir, exist_ok=True)
-            base = uuid.uuid4().hex
-            tmp_path = os.path.join(tmp_dir, base + '.wav')
+            # Copy the upload straight into memory - short clips don't need a
+            # write-to-disk/read-back round-trip before recognition
+            buf = _get_scratch_buffer()
+            audio_file.stream.seek(0)
+            shutil.copyfileobj(audio_file.stream, buf, length=1 << 20)
+            buf.seek(0)
 
-            # SpeechRecognition works best with WAV; if other format, it still may work
-            audio_file.save(tmp_path)
+            # O(N) amplitude/length scan so silent or sub-second uploads
+            # skip the expensive recognition call entirely
+            if self._has_speech(buf) is False:
+                return {'success': False, 'error': 'No speech detected in audio'}
 
-            with sr.AudioFile(tmp_path) as source:
-                # Reduce noise and capture audio
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.3)
-                audio_data = self.recognizer.record(source)
+            # Local transcription path: no network round-trip, no API quota
+            if self.stt_engine == 'whisper':
+                text, detected_lang = self._whisper_transcribe(buf, language)
+                if not text:
+                    return {'success': False, 'error': 'Could not understand the audio'}
+                logger.debug("STT success (whisper)")
+                return {
+                    'success': True,
+                    'text': text,
+                    'detected_language': detected_lang,
+                    'confidence': 0.9
+                }
+
+            try:
+                audio_data = self._record(buf, calibrate)
+            except (ValueError, EOFError):
+                # sr.AudioFile rejected the in-memory container (e.g. mp3);
+                # retry from a temporary file on disk
+                audio_data = self._record_from_disk(buf, calibrate)
 
             # Recognize speech
             lang = language if language else self.default_lang
             text = self.recognizer.recognize_google(audio_data, language=lang)
 
-            # Cleanup
-            try:
-                os.remove(tmp_path)
-            except Exception:
-                pass
-
-            logger.info("STT success")
+            logger.debug("STT success")
             return {
                 'success': True,
                 'text': text,
@@ -124,6 +378,101 @@ class SpeechHandler:
             logger.error(f"Speech-to-text failed: {e}")
             return {'success': False, 'error': 'Speech-to-text failed'}
 
+class StreamingTranscriber:
+    """
+    Incremental speech-to-text over a rolling audio buffer.
+
+    PCM chunks are appended to a bounded buffer; once at least
+    min_chunk_seconds of new audio has arrived, the whole buffer is
+    re-decoded and words are committed when two consecutive hypotheses
+    agree on them (LocalAgreement-2). After each commit the buffer is
+    trimmed past the last confirmed word's end timestamp, so the window
+    that gets reprocessed stays bounded.
+
+    Requires the 'whisper' STT engine (faster-whisper provides the word
+    timestamps the agreement check needs).
+    """
+
+    def __init__(self, speech_handler: SpeechHandler, language: Optional[str] = None,
+                 sample_rate: int = 16000, min_chunk_seconds: float = 1.0,
+                 max_buffer_seconds: float = 30.0):
+        if WhisperModel is None:
+            raise RuntimeError("StreamingTranscriber requires faster-whisper")
+        self.handler = speech_handler
+        self.language = language
+        self.sample_rate = sample_rate
+        self.min_chunk_samples = int(min_chunk_seconds * sample_rate)
+        self.max_buffer_samples = int(max_buffer_seconds * sample_rate)
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._pending_samples = 0
+        # Previous decode of the current buffer window: [(word, end_seconds)]
+        self._prev_hypothesis: List[Tuple[str, float]] = []
+
+    def add_pcm16(self, data: bytes) -> str:
+        """Append 16-bit little-endian mono PCM; returns newly committed text"""
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+        return self.add_samples(samples)
+
+    def add_samples(self, samples: np.ndarray) -> str:
+        """Append float32 samples; returns newly committed text (may be '')"""
+        self._buffer = np.concatenate([self._buffer, samples.astype(np.float32)])
+        if len(self._buffer) > self.max_buffer_samples:
+            # Hard bound on memory: drop the oldest audio. Timestamps in the
+            # previous hypothesis no longer line up, so discard it.
+            self._buffer = self._buffer[-self.max_buffer_samples:]
+            self._prev_hypothesis = []
+        self._pending_samples += len(samples)
+        if self._pending_samples < self.min_chunk_samples:
+            return ''
+        self._pending_samples = 0
+        return self._decode()
+
+    def flush(self) -> str:
+        """Commit whatever the last hypothesis contained (end of stream)"""
+        remaining = ' '.join(word for word, _ in self._prev_hypothesis).strip()
+        self._prev_hypothesis = []
+        self._buffer = np.zeros(0, dtype=np.float32)
+        return remaining
+
+    def _transcribe_words(self) -> List[Tuple[str, float]]:
+        """Decode the current buffer, returning (word, end_time) pairs"""
+        model = self.handler._get_whisper_model()
+        lang = self.language.split('-')[0].lower() if self.language else None
+        segments, _ = model.transcribe(
+            self._buffer, language=lang, word_timestamps=True, vad_filter=True)
+        words = []
+        for segment in segments:
+            for word in segment.words or []:
+                words.append((word.word.strip(), word.end))
+        return words
+
+    def _decode(self) -> str:
+        words = self._transcribe_words()
+
+        # LocalAgreement-2: commit the longest common prefix of the current
+        # and previous hypotheses over the same audio window
+        agreed = []
+        for current, previous in zip(words, self._prev_hypothesis):
+            if current[0] != previous[0]:
+                break
+            agreed.append(current)
+
+        if not agreed:
+            self._prev_hypothesis = words
+            return ''
+
+        committed_text = ' '.join(word for word, _ in agreed)
+
+        # Trim the buffer past the last confirmed word and rebase the
+        # leftover hypothesis onto the shortened window
+        cut = min(int(agreed[-1][1] * self.sample_rate), len(self._buffer))
+        cut_seconds = cut / self.sample_rate
+        self._buffer = self._buffer[cut:]
+        self._prev_hypothesis = [
+            (word, max(0.0, end - cut_seconds)) for word, end in words[len(agreed):]
+        ]
+        return committed_text
+
 if __name__ == '__main__':
     # Simple manual tests
     sh = SpeechHandler()
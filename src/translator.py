@@ -12,110 +12,352 @@ Author: Soul-19129
 License: MIT
 """
 
+import asyncio
 import googletrans
 from googletrans import Translator, LANGUAGES
 import logging
+import queue
+import sqlite3
 import time
 import json
-import hashlib
 import os
-from typing import Dict, Optional, Union, List
+from typing import Dict, Literal, Optional, Union, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 import threading
-from datetime import datetime, timedelta
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+
+# Language lookups are hot (one per translate call) over a tiny fixed set
+# of ~100 codes, so memoized module-level helpers avoid the per-call
+# .lower() allocation; LANGUAGES is the same map for every instance.
+@lru_cache(maxsize=256)
+def _norm_lang(code: Optional[str]) -> str:
+    """Normalized (lowercase, stripped) form of a language code"""
+    return code.lower().strip() if code else ''
+
+
+@lru_cache(maxsize=512)
+def _is_supported(language_code: str) -> bool:
+    return language_code.lower() in LANGUAGES
+
+
+@lru_cache(maxsize=512)
+def _language_name(language_code: str) -> str:
+    return LANGUAGES.get(language_code.lower(), 'Unknown')
+
 class TranslationCache:
     """
-    Simple in-memory cache for translations with expiration
+    Sharded in-memory LRU cache for translations with expiration
+
+    Keys are spread across a power-of-two number of shards, each its own
+    OrderedDict guarded by its own Lock, so concurrent get/set calls from
+    batch workers contend on 1/N of the cache instead of one global lock.
+    Entries are (value, expiry) tuples; eviction pops the least recently
+    used entry of the shard in O(1), and expiry is checked lazily on
+    access against time.monotonic().
+
+    With persist_path set, a sqlite table backs the memory tier so warm
+    translations survive restarts: memory misses fall through to disk
+    (and promote back into memory), while writes go through a background
+    queue so the translate path never waits on a transaction.
     """
-    def __init__(self, max_size: int = 1000, expire_hours: int = 24):
-        self.cache = {}
-        self.timestamps = {}
+
+    SHARD_COUNT = 16  # power of two, so shard selection is a bit mask
+    _PERSIST_BATCH = 100
+
+    def __init__(self, max_size: int = 1000, expire_hours: int = 24,
+                 persist_path: Optional[str] = None):
         self.max_size = max_size
-        self.expire_delta = timedelta(hours=expire_hours)
-        self.lock = threading.RLock()
-    
-    def _is_expired(self, key: str) -> bool:
-        """Check if cache entry is expired"""
-        if key not in self.timestamps:
-            return True
-        return datetime.now() - self.timestamps[key] > self.expire_delta
-    
-    def _cleanup_expired(self):
-        """Remove expired entries"""
-        expired_keys = [k for k in self.timestamps if self._is_expired(k)]
-        for key in expired_keys:
-            self.cache.pop(key, None)
-            self.timestamps.pop(key, None)
-    
-    def get(self, key: str) -> Optional[Dict]:
-        """Get cached translation"""
-        with self.lock:
-            if key in self.cache and not self._is_expired(key):
-                return self.cache[key]
+        self.expire_seconds = expire_hours * 3600.0
+        self._shard_max = max(1, max_size // self.SHARD_COUNT)
+        self._shards = [OrderedDict() for _ in range(self.SHARD_COUNT)]
+        self._locks = [threading.Lock() for _ in range(self.SHARD_COUNT)]
+        self._db = None
+        if persist_path:
+            self._db = sqlite3.connect(persist_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS cache '
+                '(key TEXT PRIMARY KEY, value TEXT, ts REAL)')
+            self._db.commit()
+            self._db_lock = threading.Lock()
+            self._write_queue: "queue.Queue" = queue.Queue(maxsize=10000)
+            threading.Thread(target=self._persist_worker,
+                             name='cache-persist', daemon=True).start()
+
+    @staticmethod
+    def _persist_key(key) -> str:
+        """Serialize a (possibly tuple) cache key for the sqlite tier"""
+        if isinstance(key, str):
+            return key
+        return json.dumps(key, ensure_ascii=False)
+
+    def _persist_worker(self):
+        """Drain queued writes in batches to amortize transaction cost"""
+        while True:
+            rows = [self._write_queue.get()]
+            while len(rows) < self._PERSIST_BATCH:
+                try:
+                    rows.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self._db_lock:
+                    self._db.executemany(
+                        'INSERT OR REPLACE INTO cache (key, value, ts) '
+                        'VALUES (?, ?, ?)', rows)
+                    self._db.commit()
+            except Exception as e:
+                logger.warning(f"Cache persistence write failed: {e}")
+
+    def _get_persisted(self, key) -> Optional[Dict]:
+        """Disk-tier lookup; expired rows are deleted on sight"""
+        pkey = self._persist_key(key)
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    'SELECT value, ts FROM cache WHERE key = ?',
+                    (pkey,)).fetchone()
+                if row is None:
+                    return None
+                value, ts = row
+                # Wall-clock timestamps: monotonic time is meaningless
+                # across process restarts
+                if time.time() - ts > self.expire_seconds:
+                    self._db.execute('DELETE FROM cache WHERE key = ?', (pkey,))
+                    self._db.commit()
+                    return None
+            return json.loads(value)
+        except Exception as e:
+            logger.warning(f"Cache persistence read failed: {e}")
             return None
-    
-    def set(self, key: str, value: Dict):
-        """Set cached translation"""
-        with self.lock:
-            # Clean up if cache is getting too large
-            if len(self.cache) >= self.max_size:
-                self._cleanup_expired()
-                # If still too large, remove oldest entries
-                if len(self.cache) >= self.max_size:
-                    oldest_keys = sorted(self.timestamps.keys(), 
-                                       key=lambda k: self.timestamps[k])[:100]
-                    for key in oldest_keys:
-                        self.cache.pop(key, None)
-                        self.timestamps.pop(key, None)
-            
-            self.cache[key] = value
-            self.timestamps[key] = datetime.now()
+
+    def _shard(self, key):
+        index = hash(key) & (self.SHARD_COUNT - 1)
+        return self._shards[index], self._locks[index]
+
+    def get(self, key) -> Optional[Dict]:
+        """
+        Get cached translation (None when absent or expired)
+
+        The lookup itself is lock-free: a single-key read is atomic under
+        the GIL, and the worst a race with a concurrent set() can produce
+        is a spurious None, which just sends the caller to the API. Only
+        the LRU recency update takes the shard lock, and skips it rather
+        than blocking when a writer holds it.
+        """
+        shard, lock = self._shard(key)
+        entry = shard.get(key)
+        if entry is None:
+            if self._db is not None:
+                value = self._get_persisted(key)
+                if value is not None:
+                    self._set_memory(key, value)
+                return value
+            return None
+        value, expiry = entry
+        if time.monotonic() > expiry:
+            if lock.acquire(blocking=False):
+                try:
+                    shard.pop(key, None)
+                finally:
+                    lock.release()
+            return None
+        if lock.acquire(blocking=False):
+            try:
+                if key in shard:
+                    shard.move_to_end(key)
+            finally:
+                lock.release()
+        return value
+
+    def _set_memory(self, key, value: Dict):
+        """Memory-tier insert, evicting the shard's LRU entry when full"""
+        shard, lock = self._shard(key)
+        with lock:
+            if key in shard:
+                shard.move_to_end(key)
+            while len(shard) >= self._shard_max:
+                shard.popitem(last=False)
+            shard[key] = (value, time.monotonic() + self.expire_seconds)
+
+    def set(self, key, value: Dict):
+        """Set cached translation in memory and queue the disk write"""
+        self._set_memory(key, value)
+        if self._db is not None:
+            try:
+                self._write_queue.put_nowait(
+                    (self._persist_key(key),
+                     json.dumps(value, ensure_ascii=False),
+                     time.time()))
+            except queue.Full:
+                pass  # persistence is best-effort; memory tier is current
+
+    def clear(self):
+        """Drop every cache entry"""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    self._db.execute('DELETE FROM cache')
+                    self._db.commit()
+            except Exception as e:
+                logger.warning(f"Cache persistence clear failed: {e}")
+
+    def __len__(self):
+        # Advisory count: summed without locking, stats don't need to be exact
+        return sum(len(shard) for shard in self._shards)
 
 class HumanTranslator:
     """
     Main translator class that handles text translation using Google Translate API
     """
     
-    def __init__(self, cache_size: int = 1000, rate_limit_delay: float = 0.1):
+    def __init__(self, cache_size: int = 1000, rate_limit_delay: float = 0.1,
+                 burst_capacity: int = 5,
+                 rate_limit_strategy: Literal['fixed', 'token', 'sliding'] = 'token',
+                 persist_path: Optional[str] = None):
         """
         Initialize the HumanTranslator
-        
+
         Args:
             cache_size (int): Maximum number of translations to cache
-            rate_limit_delay (float): Delay between API calls to avoid rate limiting
+            rate_limit_delay (float): Average delay between API calls; the
+                sustained rate is 1/rate_limit_delay requests per second
+            burst_capacity (int): Requests allowed to pass without waiting
+                after an idle period (token-bucket burst size)
+            rate_limit_strategy (str): 'token' (default) for the bursty
+                token bucket, 'sliding' for a weighted sliding window that
+                paces requests smoothly across window boundaries, or
+                'fixed' for the simple fixed-delay behaviour
+            persist_path (str, optional): sqlite file backing the cache so
+                warm translations survive process restarts
         """
         self.translator = Translator()
-        self.cache = TranslationCache(max_size=cache_size)
+        self.cache = TranslationCache(max_size=cache_size,
+                                      persist_path=persist_path)
+        # Batch-level memo keyed by (text, source, target), shared across
+        # translate_batch calls so repeated batches of the same material
+        # skip the API without even hashing a cache key. Cleared wholesale
+        # when it grows past the cache size as a coarse bound.
+        self.already_translated: Dict[tuple, Dict] = {}
+        self.memo_lock = threading.Lock()
+        # Shared executor for overlapping multi-chunk batches, created on
+        # first use so single-shot scripts never pay for the threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = 0
+        self.rate_limit_strategy = rate_limit_strategy
         self.request_lock = threading.Lock()
+        # Token bucket: credit accrues while idle (up to burst_capacity), so
+        # warm callers pass straight through instead of paying a fixed sleep,
+        # and short bursts are absorbed without exceeding the sustained rate
+        self._refill_rate = (1.0 / rate_limit_delay) if rate_limit_delay > 0 else float('inf')
+        self._capacity = float(max(1, burst_capacity))
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+        # Fixed-delay state
+        self._last_request = 0.0
+        # Sliding window state: the previous window's count is weighted by
+        # how much of it still overlaps the trailing window, smoothing
+        # pacing across window boundaries without a fixed sleep per call
+        self._window_size = 1.0
+        self._max_per_window = self._refill_rate * self._window_size
+        self._window_start = time.monotonic()
+        self._prev_count = 0
+        self._curr_count = 0
         
-        # Initialize supported languages
+        # Initialize supported languages; the dict serves name lookups,
+        # the frozenset serves the hot membership checks (googletrans
+        # keys are already lowercase)
         self.supported_languages = LANGUAGES
+        self._supported_codes: frozenset = frozenset(LANGUAGES.keys())
         
         logger.info(f"HumanTranslator initialized with {len(self.supported_languages)} supported languages")
     
-    def _generate_cache_key(self, text: str, target_lang: str, source_lang: Optional[str] = None) -> str:
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the shared batch executor (double-checked)"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=8, thread_name_prefix='translate-batch')
+        return self._executor
+
+    def _rate_limit(self):
         """
-        Generate a unique cache key for the translation request
+        Pace upstream requests according to rate_limit_strategy:
+        'token' takes from a refilling bucket (bursty but rate-bounded),
+        'sliding' compares a weighted two-window count against the window
+        budget, and 'fixed' enforces a plain delay since the last request
         """
-        key_string = f"{text}:{source_lang or 'auto'}:{target_lang}"
-        return hashlib.md5(key_string.encode('utf-8')).hexdigest()
-    
-    def _rate_limit(self):
+        if self._refill_rate == float('inf'):
+            return
+        if self.rate_limit_strategy == 'sliding':
+            self._rate_limit_sliding()
+        elif self.rate_limit_strategy == 'fixed':
+            self._rate_limit_fixed()
+        else:
+            self._rate_limit_token()
+
+    def _rate_limit_token(self):
+        """Take a token when available, else sleep until one refills"""
+        with self.request_lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity,
+                               self._tokens + (now - self._last_refill) * self._refill_rate)
+            self._last_refill = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            time.sleep((1.0 - self._tokens) / self._refill_rate)
+            self._last_refill = time.monotonic()
+            self._tokens = 0.0
+
+    def _rate_limit_fixed(self):
+        """Sleep whatever remains of rate_limit_delay since the last request"""
+        with self.request_lock:
+            now = time.monotonic()
+            wait = self.rate_limit_delay - (now - self._last_request)
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.monotonic()
+
+    def _rate_limit_sliding(self):
         """
-        Implement simple rate limiting to avoid hitting API limits
+        Weighted sliding window: estimate the request count over the
+        trailing window as prev_count scaled by its remaining overlap
+        plus curr_count, and sleep proportionally when over budget
         """
         with self.request_lock:
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.rate_limit_delay:
-                time.sleep(self.rate_limit_delay - time_since_last)
-            self.last_request_time = time.time()
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            if elapsed >= self._window_size:
+                # Rotate; windows older than one full size count as empty
+                self._prev_count = self._curr_count if elapsed < 2 * self._window_size else 0
+                self._curr_count = 0
+                self._window_start += (elapsed // self._window_size) * self._window_size
+                elapsed = now - self._window_start
+            weighted = (self._prev_count * (1.0 - elapsed / self._window_size)
+                        + self._curr_count)
+            if weighted >= self._max_per_window:
+                overshoot = weighted - self._max_per_window + 1.0
+                time.sleep(overshoot * self._window_size / self._max_per_window)
+                now = time.monotonic()
+                elapsed = now - self._window_start
+                if elapsed >= self._window_size:
+                    self._prev_count = self._curr_count if elapsed < 2 * self._window_size else 0
+                    self._curr_count = 0
+                    self._window_start += (elapsed // self._window_size) * self._window_size
+            self._curr_count += 1
     
     def detect_language(self, text: str) -> Dict[str, Union[str, float]]:
         """
@@ -171,17 +413,33 @@ class HumanTranslator:
                 }
             
             text = text.strip()
-            target_language = target_language.lower().strip()
+            target_language = _norm_lang(target_language)
             
             # Validate target language
-            if target_language not in self.supported_languages:
+            if target_language not in self._supported_codes:
                 return {
                     'success': False,
                     'error': f'Unsupported target language: {target_language}'
                 }
             
+            # Explicit pass-through: nothing to translate and nothing worth
+            # caching, so return before any cache-key or hashing work
+            if (source_language and source_language != 'auto'
+                    and _norm_lang(source_language) == target_language):
+                return {
+                    'success': True,
+                    'translated_text': text,
+                    'detected_language': target_language,
+                    'confidence': 1.0,
+                    'original_text': text,
+                    'cached': False
+                }
+
             # Check cache first
-            cache_key = self._generate_cache_key(text, target_language, source_language)
+            # Plain tuple key: string hashes are computed lazily and cached
+            # by CPython, so this skips the encode + digest work a hashed
+            # string key would cost on every hit and miss
+            cache_key = (text, source_language or 'auto', target_language)
             cached_result = self.cache.get(cache_key)
             if cached_result:
                 logger.info(f"Cache hit for translation: {text[:50]}...")
@@ -198,17 +456,19 @@ class HumanTranslator:
                 source_language = detection_result['language']
                 detected_confidence = detection_result['confidence']
             else:
-                source_language = source_language.lower().strip()
-                if source_language not in self.supported_languages:
+                source_language = _norm_lang(source_language)
+                if source_language not in self._supported_codes:
                     return {
                         'success': False,
                         'error': f'Unsupported source language: {source_language}'
                     }
                 detected_confidence = 1.0  # Assume high confidence for manually specified language
             
-            # Skip translation if source and target are the same
+            # Skip translation if source and target are the same; identity
+            # results are free to recompute, so don't spend LRU slots (and
+            # evictions) on them
             if source_language == target_language:
-                result = {
+                return {
                     'success': True,
                     'translated_text': text,
                     'detected_language': source_language,
@@ -216,8 +476,6 @@ class HumanTranslator:
                     'original_text': text,
                     'cached': False
                 }
-                self.cache.set(cache_key, result)
-                return result
             
             # Perform translation
             self._rate_limit()
@@ -260,37 +518,161 @@ class HumanTranslator:
                 'error': error_msg
             }
     
-    def translate_batch(self, 
-                       texts: List[str], 
-                       target_language: str, 
-                       source_language: Optional[str] = None) -> List[Dict]:
+    def translate_batch(self,
+                       texts: List[str],
+                       target_language: str,
+                       source_language: Optional[str] = None,
+                       batch_size: int = 25) -> List[Dict]:
         """
         Translate multiple texts at once
-        
+
+        Cache hits are resolved locally; the remaining texts are sent to the
+        API as a list, so a batch costs one round trip per batch_size chunk
+        instead of one request per text.
+
         Args:
             texts (List[str]): List of texts to translate
             target_language (str): Target language code
             source_language (str, optional): Source language code
-            
+            batch_size (int): Maximum texts per upstream request
+
         Returns:
-            List of translation results
+            List of translation results, in input order
         """
-        results = []
-        
-        for text in texts:
-            result = self.translate(
-                text=text,
-                target_language=target_language,
-                source_language=source_language
-            )
-            results.append(result)
-            
-            # Small delay between batch translations to avoid rate limiting
-            if len(texts) > 1:
-                time.sleep(0.05)
-        
+        results: List[Optional[Dict]] = [None] * len(texts)
+        target = _norm_lang(target_language)
+        source = source_language or 'auto'
+        pending: Dict[str, List[int]] = {}  # unique miss text -> result indices
+
+        for i, text in enumerate(texts):
+            # Empty input and unsupported targets go through the single-item
+            # path, which already produces the right error results
+            if not text or not text.strip() or target not in self._supported_codes:
+                results[i] = self.translate(text, target_language, source_language)
+                continue
+
+            stripped = text.strip()
+            with self.memo_lock:
+                memoized = self.already_translated.get((stripped, source, target))
+            if memoized:
+                results[i] = memoized
+                continue
+
+            cached = self.cache.get((stripped, source, target))
+            if cached:
+                results[i] = cached
+                continue
+
+            # Duplicates within the batch collapse onto one pending slot
+            pending.setdefault(stripped, []).append(i)
+
+        misses = list(pending.items())
+        chunks = [misses[start:start + batch_size]
+                  for start in range(0, len(misses), batch_size)]
+
+        # One chunk runs inline; several run concurrently on the shared
+        # executor so their round trips overlap. The token bucket in
+        # _rate_limit still paces the actual request rate - the threads
+        # only hide latency.
+        if len(chunks) <= 1:
+            for chunk in chunks:
+                self._translate_chunk(chunk, target, source_language, results)
+        else:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(self._translate_chunk, chunk, target,
+                                source_language, results)
+                for chunk in chunks
+            ]
+            for future in futures:
+                future.result()
+
         return results
+
+    def _translate_chunk(self,
+                        chunk: List[tuple],
+                        target: str,
+                        source_language: Optional[str],
+                        results: List[Optional[Dict]]):
+        """
+        Translate one chunk of (text, result indices) pairs in a single
+        upstream request, writing results into their slots
+        """
+        source = source_language or 'auto'
+        chunk_texts = [stripped for stripped, _ in chunk]
+        try:
+            self._rate_limit()
+            translations = self.translator.translate(
+                chunk_texts,
+                src=source,
+                dest=target
+            )
+            for (stripped, indices), translation in zip(chunk, translations):
+                result = {
+                    'success': True,
+                    'translated_text': translation.text,
+                    'detected_language': translation.src,
+                    'confidence': 1.0 if source_language else 0.9,
+                    'original_text': stripped,
+                    'source_language_name': self.supported_languages.get(translation.src, 'Unknown'),
+                    'target_language_name': self.supported_languages.get(target, 'Unknown'),
+                    'cached': False
+                }
+                self.cache.set((stripped, source, target), result)
+                with self.memo_lock:
+                    if len(self.already_translated) >= self.cache.max_size:
+                        self.already_translated.clear()
+                    self.already_translated[(stripped, source, target)] = result
+                for i in indices:
+                    results[i] = result
+        except Exception as e:
+            error_msg = f"Translation failed: {str(e)}"
+            logger.error(error_msg)
+            for _, indices in chunk:
+                for i in indices:
+                    results[i] = {
+                        'success': False,
+                        'error': error_msg
+                    }
     
+    async def atranslate(self,
+                        text: str,
+                        target_language: str,
+                        source_language: Optional[str] = None) -> Dict:
+        """
+        Async counterpart of translate() for event-loop based callers.
+
+        The pinned googletrans release only ships a synchronous client, so
+        the call runs on the shared batch executor; awaiting it keeps the
+        event loop free while the HTTP round trip is in flight. Cache and
+        rate-limit behaviour is identical to translate().
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            lambda: self.translate(text, target_language, source_language)
+        )
+
+    async def atranslate_batch(self,
+                              texts: List[str],
+                              target_language: str,
+                              source_language: Optional[str] = None,
+                              concurrency: int = 8) -> List[Dict]:
+        """
+        Translate many texts concurrently from async code.
+
+        A semaphore bounds the number of in-flight translations; the token
+        bucket still paces the actual upstream request rate. Results come
+        back in input order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(text: str) -> Dict:
+            async with semaphore:
+                return await self.atranslate(text, target_language, source_language)
+
+        return list(await asyncio.gather(*(bounded(text) for text in texts)))
+
     def get_supported_languages(self) -> Dict[str, str]:
         """
         Get dictionary of supported language codes and names
@@ -310,7 +692,7 @@ class HumanTranslator:
         Returns:
             bool: True if supported, False otherwise
         """
-        return language_code.lower() in self.supported_languages
+        return _is_supported(language_code)
     
     def get_language_name(self, language_code: str) -> str:
         """
@@ -322,15 +704,13 @@ class HumanTranslator:
         Returns:
             str: Language name or 'Unknown' if not found
         """
-        return self.supported_languages.get(language_code.lower(), 'Unknown')
+        return _language_name(language_code)
     
     def clear_cache(self):
         """
         Clear the translation cache
         """
-        with self.cache.lock:
-            self.cache.cache.clear()
-            self.cache.timestamps.clear()
+        self.cache.clear()
         logger.info("Translation cache cleared")
     
     def get_cache_stats(self) -> Dict[str, int]:
@@ -340,25 +720,30 @@ class HumanTranslator:
         Returns:
             Dict with cache size and hit information
         """
-        with self.cache.lock:
-            return {
-                'cache_size': len(self.cache.cache),
-                'max_size': self.cache.max_size
-            }
+        return {
+            'cache_size': len(self.cache),
+            'max_size': self.cache.max_size
+        }
 
 # Create a global translator instance for easy import
 translator_instance = None
+_singleton_lock = threading.Lock()
 
 def get_translator() -> HumanTranslator:
     """
     Get a singleton instance of HumanTranslator
-    
+
+    Thread-safe: double-checked locking so concurrent first callers do
+    not each construct (and pay HTTP client init for) their own instance.
+
     Returns:
         HumanTranslator: Singleton translator instance
     """
     global translator_instance
     if translator_instance is None:
-        translator_instance = HumanTranslator()
+        with _singleton_lock:
+            if translator_instance is None:
+                translator_instance = HumanTranslator()
     return translator_instance
 
 if __name__ == "__main__":
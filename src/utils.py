@@ -10,11 +10,16 @@ Author: Soul-19129
 License: MIT
 """
 
+import atexit
+import functools
 import os
 import json
 import logging
+import queue
+import re
+import threading
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Tuple
 
 # googletrans language map is used in translator module; to avoid a hard dependency here,
 # we allow passing a fallback language list if needed.
@@ -32,22 +37,32 @@ LANG_CACHE_FILE = os.path.join('logs', 'languages_cache.json')
 TRANSLATION_LOG_FILE = os.path.join('logs', 'translations.log')
 
 
+# Precomputed once: membership sets for validate_language_code so the
+# hot path is a strip/lower plus one frozenset probe
+_SUPPORTED_CODES = frozenset(GOOGLE_LANGUAGES)
+_ISO_LENGTHS = frozenset({2, 3})
+
+
 def validate_language_code(code: str) -> bool:
     """
     Validate language code presence in googletrans LANGUAGES mapping
     """
-    if not code or len(code) < 2:
+    if not code:
         return False
-    code = code.lower().strip()
-    if GOOGLE_LANGUAGES:
-        return code in GOOGLE_LANGUAGES
-    # Fallback: accept ISO-like two-letter codes when map not available
-    return len(code) in (2, 3)
+    code = code.strip().lower()
+    if _SUPPORTED_CODES:
+        return code in _SUPPORTED_CODES
+    # Fallback: accept ISO-like two/three-letter codes when map not available
+    return len(code) in _ISO_LENGTHS
 
 
+@functools.lru_cache(maxsize=1)
 def get_supported_languages() -> Dict[str, str]:
     """
     Return supported languages mapping, caching to file for quick reuse
+
+    Memoized: the mapping never changes within a process, so repeat calls
+    skip both the dict rebuild and the cache-file write.
     """
     try:
         if GOOGLE_LANGUAGES:
@@ -58,7 +73,8 @@ def get_supported_languages() -> Dict[str, str]:
                 'de': 'German', 'it': 'Italian', 'tr': 'Turkish', 'ru': 'Russian',
                 'zh-cn': 'Chinese (Simplified)', 'ja': 'Japanese', 'ko': 'Korean'
             }
-        # Cache to file
+        # Cache to file; the lru_cache means this runs once per process,
+        # and rewriting keeps a stale file from pinning an old mapping
         with open(LANG_CACHE_FILE, 'w', encoding='utf-8') as f:
             json.dump(langs, f, ensure_ascii=False, indent=2)
         return langs
@@ -74,22 +90,89 @@ def get_supported_languages() -> Dict[str, str]:
         return {}
 
 
+# Translation events go through a bounded queue to a single writer thread
+# so the hot path never pays open/write/close syscalls per translation.
+_log_queue: "queue.Queue" = queue.Queue(maxsize=10000)
+_log_dropped = 0
+_LOG_BATCH_SIZE = 100
+_log_thread = None
+_log_thread_lock = threading.Lock()
+
+
+def _log_worker():
+    """Drain the log queue in batches with one buffered file handle."""
+    try:
+        handle = open(TRANSLATION_LOG_FILE, 'a', buffering=1 << 16, encoding='utf-8')
+    except Exception as e:
+        logger.warning(f"Failed to open translation log: {e}")
+        return
+    while True:
+        event = _log_queue.get()
+        if event is None:
+            break
+        lines = [json.dumps(event, ensure_ascii=False)]
+        while len(lines) < _LOG_BATCH_SIZE:
+            try:
+                event = _log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is None:
+                handle.write("\n".join(lines) + "\n")
+                handle.close()
+                return
+            lines.append(json.dumps(event, ensure_ascii=False))
+        try:
+            handle.write("\n".join(lines) + "\n")
+            handle.flush()
+        except Exception as e:
+            logger.warning(f"Failed to write translation log: {e}")
+    handle.close()
+
+
+def _drain_log_queue():
+    """Signal the writer to flush remaining events and stop (atexit)."""
+    if _log_thread is not None and _log_thread.is_alive():
+        try:
+            _log_queue.put_nowait(None)
+        except queue.Full:
+            return
+        _log_thread.join(timeout=2.0)
+
+
+def _ensure_log_thread():
+    global _log_thread
+    if _log_thread is None or not _log_thread.is_alive():
+        with _log_thread_lock:
+            if _log_thread is None or not _log_thread.is_alive():
+                _log_thread = threading.Thread(target=_log_worker,
+                                               name='translation-log',
+                                               daemon=True)
+                _log_thread.start()
+                atexit.register(_drain_log_queue)
+
+
 def log_translation(original_text: str, translated_text: str, source_lang: str, target_lang: str):
     """
-    Append a translation event to logs/translations.log as JSON line
+    Queue a translation event for logs/translations.log (JSON lines).
+
+    Events are written by a background thread in batches; under overload
+    the queue drops events rather than blocking the translation path.
     """
+    global _log_dropped
+    event = {
+        'timestamp': datetime.now().isoformat(),
+        'source_lang': source_lang,
+        'target_lang': target_lang,
+        'original_len': len(original_text or ''),
+        'translated_len': len(translated_text or '')
+    }
+    _ensure_log_thread()
     try:
-        event = {
-            'timestamp': datetime.now().isoformat(),
-            'source_lang': source_lang,
-            'target_lang': target_lang,
-            'original_len': len(original_text or ''),
-            'translated_len': len(translated_text or '')
-        }
-        with open(TRANSLATION_LOG_FILE, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(event, ensure_ascii=False) + "\n")
-    except Exception as e:
-        logger.warning(f"Failed to log translation: {e}")
+        _log_queue.put_nowait(event)
+    except queue.Full:
+        _log_dropped += 1
+        if _log_dropped % 1000 == 1:
+            logger.warning(f"Translation log queue full; dropped {_log_dropped} events")
 
 
 def sanitize_text(text: str, max_len: int = 5000) -> str:
@@ -98,17 +181,105 @@ def sanitize_text(text: str, max_len: int = 5000) -> str:
     """
     if text is None:
         return ''
-    text = text.strip()
-    if len(text) > max_len:
-        text = text[:max_len]
-    return text
+    # Fast path: short, already-trimmed input (the common case) is
+    # returned as-is without allocating a stripped copy
+    if len(text) <= max_len and text == text.strip():
+        return text
+    # Strip before slicing so trailing whitespace doesn't eat into the
+    # length budget
+    return text.strip()[:max_len]
 
 
-def chunk_text(text: str, chunk_size: int = 4000) -> List[str]:
+# Sentence boundaries: Latin and CJK terminators followed by whitespace
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?。！？])\s+')
+
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Yield sentences one at a time without materializing the full list"""
+    start = 0
+    for match in _SENTENCE_SPLIT.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+
+def iter_chunks(text: str, chunk_size: int = 4000) -> Iterator[str]:
     """
-    Split long text into chunks suitable for translation services limits
+    Lazily yield translation-sized chunks of text.
+
+    Streaming counterpart of chunk_text: only the chunk being packed is
+    held in memory, so bulk jobs avoid keeping a second full copy of the
+    document as a chunk list. Chunks align to sentence boundaries where
+    possible; unpunctuated text and sentences longer than chunk_size are
+    sliced. The whole input is chunked - callers wanting a length cap
+    should sanitize_text() first with their own max_len.
     """
-    text = sanitize_text(text)
+    # No sanitize_text here: its default max_len would silently truncate
+    # exactly the large documents chunking exists for
+    text = text.strip() if text else ''
     if not text:
-        return []
-    return [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
+        return
+    if len(text) <= chunk_size:
+        yield text
+        return
+
+    current: List[str] = []
+    current_len = 0
+    for sentence in _iter_sentences(text):
+        if len(sentence) > chunk_size:
+            # Oversized sentence (or text with no markers at all):
+            # flush what we have, then slice it
+            if current:
+                yield ' '.join(current)
+                current, current_len = [], 0
+            for i in range(0, len(sentence), chunk_size):
+                yield sentence[i:i+chunk_size]
+            continue
+        # +1 accounts for the joining space
+        if current and current_len + 1 + len(sentence) > chunk_size:
+            yield ' '.join(current)
+            current, current_len = [], 0
+        current.append(sentence)
+        current_len += len(sentence) + (1 if current_len else 0)
+    if current:
+        yield ' '.join(current)
+
+
+def chunk_text(text: str, chunk_size: int = 4000) -> List[str]:
+    """
+    Split long text into chunks suitable for translation services limits.
+
+    Chunks align to sentence boundaries where possible so identical
+    sentences hash the same across documents and hit the translation
+    cache; mid-word slicing is only used for unpunctuated text or
+    sentences longer than chunk_size. Prefer iter_chunks for large
+    documents to keep peak memory at one chunk.
+    """
+    return list(iter_chunks(text, chunk_size))
+
+
+def chunk_text_dedup(text: str, chunk_size: int = 4000) -> Tuple[List[str], List[int]]:
+    """
+    Chunk text and deduplicate repeated chunks for translation.
+
+    Returns (unique_chunks, index_map) where index_map[i] gives the
+    position in unique_chunks of the i-th original chunk. Identical
+    chunks (boilerplate headers/footers across documents) are translated
+    only once:
+
+        uniques, idx = chunk_text_dedup(text)
+        results = translator.translate_batch(uniques, target)
+        full = "".join(results[i]['translated_text'] for i in idx)
+    """
+    chunks = chunk_text(text, chunk_size)
+    unique_chunks: List[str] = []
+    positions: Dict[str, int] = {}
+    index_map: List[int] = []
+    for chunk in chunks:
+        pos = positions.get(chunk)
+        if pos is None:
+            pos = len(unique_chunks)
+            positions[chunk] = pos
+            unique_chunks.append(chunk)
+        index_map.append(pos)
+    return unique_chunks, index_map
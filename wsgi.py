@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HumanTranslator - WSGI Entrypoint
+=================================
+
+Production entrypoint for running the app under gunicorn instead of the
+Werkzeug development server:
+
+    USE_GEVENT=true gunicorn -k gevent -w $((2 * $(nproc) + 1)) \
+        --worker-connections 1000 --keep-alive 5 wsgi:app
+
+The gevent worker class keeps workers responsive while requests wait on
+the upstream translation/TTS/STT HTTP calls.
+
+Author: Soul-19129
+License: MIT
+"""
+
+import os
+import sys
+
+# Application modules use flat imports (from translator import ...), so
+# src/ must be on the path before importing the app
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from app import app  # noqa: E402
+
+if __name__ == '__main__':
+    app.run()